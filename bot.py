@@ -1,30 +1,131 @@
 import logging
+from logging.handlers import RotatingFileHandler
 import os
 import asyncio
 import aiohttp
+import io
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 import re
-from functools import wraps
+import reprlib
+import signal
+import sys
+from functools import lru_cache, wraps
 
 from telegram import Update, Message, User, Chat, BotCommand
+from telegram.helpers import escape_markdown
 from telegram.ext import (
-    Application, CommandHandler, MessageHandler,
+    AIORateLimiter, Application, CommandHandler, MessageHandler,
     filters, ContextTypes, JobQueue
 )
-from config import settings
-from database.database import init_db, get_db
-from database.models import IdentifierRecord, DuplicateAlert
-from sqlalchemy import func
-from sqlalchemy.orm import Session
-
-# Configure logging
-logging.basicConfig(
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    level=settings.LOG_LEVEL
+from config import get_settings
+from database.database import (
+    init_db, get_db, close_db_connection, find_identifiers, bulk_insert_identifiers
 )
+from database.models import IdentifierRecord, DuplicateAlert, normalize_identifier
+from sqlalchemy import case, func, select
+
 logger = logging.getLogger(__name__)
 
+# Update types the bot subscribes to for webhook and polling. The handlers only act
+# on messages; callback queries and (my_)chat_member updates are kept deliberately
+# so inline buttons and membership changes can be handled without re-registering
+# the webhook. chat_member is opt-in on Telegram's side and adds traffic in busy
+# groups. Set DEBUG_ALL_UPDATES=true to receive every update type while debugging.
+if os.getenv('DEBUG_ALL_UPDATES', '').lower() == 'true':
+    _ALLOWED_UPDATES = tuple(Update.ALL_TYPES)
+else:
+    _ALLOWED_UPDATES = (
+        Update.MESSAGE,
+        Update.EDITED_MESSAGE,
+        Update.CALLBACK_QUERY,
+        Update.CHAT_MEMBER,
+        Update.MY_CHAT_MEMBER,
+    )
+
+# Bounded repr for logging failing updates. Arbitrary objects are still rendered
+# with their full repr() before truncation; the saving is rendering the update once
+_ERR_REPR = reprlib.Repr()
+_ERR_REPR.maxstring = 500
+_ERR_REPR.maxother = 500
+_ERR_REPR.maxlevel = 3
+
+# Queued inserts are flushed once this many rows are pending or the delay elapses
+_WRITE_BATCH_SIZE = 500
+_WRITE_BATCH_DELAY = 0.05  # seconds
+
+# Number of identifiers shown per /list page
+_LIST_PAGE_SIZE = 50
+
+# Flush threshold for multi-message replies, below Telegram's 4096 character limit
+_MESSAGE_CHUNK_SIZE = 3900
+
+# Longest identifier the database column can hold; longer text can't match
+_MAX_IDENTIFIER_LENGTH = IdentifierRecord.__table__.c.identifier.type.length
+
+_UUID_RE = re.compile(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$')
+
+# Duplicate alert message (MarkdownV2); static parts are escaped once here
+_ALERT_TEMPLATE = (
+    "*🚨 DUPLICATE IDENTIFIER DETECTED 🚨*\n\n"
+    "⚠️ *TYPE\\:* `{type}`\n"
+    "🔑 *Identifier\\:* `{identifier}`\n"
+    "📅 *First Seen\\:* `{first_seen}`\n"
+    "👤 *Reported by\\:* {user}\n\n"
+    "*Please verify this transaction before proceeding\\!*\n"
+    "_This identifier has been previously processed\\._"
+)
+
+# Character class bits used by _classify_identifier
+_CHAR_DIGIT = 1
+_CHAR_ALPHA = 2
+_CHAR_OTHER = 4
+
+
+@lru_cache(maxsize=4096)
+def _classify_identifier(identifier: str) -> str:
+    """Classify an identifier by its format (see AIVABot.determine_identifier_type)."""
+    # Remove any whitespace for type detection
+    clean_identifier = ''.join(identifier.split())
+    
+    # Check for empty string
+    if not clean_identifier:
+        return 'unknown'
+        
+    # Check for UUID format; only strings of the right length pay for the regex
+    if len(clean_identifier) == 36 and _UUID_RE.match(clean_identifier.lower()):
+        return 'uuid'
+        
+    # Check for email
+    if '@' in clean_identifier and '.' in clean_identifier.split('@')[-1]:
+        return 'email'
+    
+    # Classify characters in a single pass
+    flags = 0
+    for c in clean_identifier:
+        flags |= _CHAR_DIGIT if c.isdigit() else (_CHAR_ALPHA if c.isalpha() else _CHAR_OTHER)
+        
+    # Check if it's all digits (could be phone, account number, etc.)
+    if flags == _CHAR_DIGIT:
+        length = len(clean_identifier)
+        if 8 <= length <= 15:
+            return 'phone'
+        elif 16 <= length <= 20:
+            return 'account_number'
+        elif length > 20:
+            return 'large_number'
+        return 'numeric'
+        
+    # If it contains both letters and numbers, it's likely a reference code
+    if flags & (_CHAR_ALPHA | _CHAR_DIGIT) == _CHAR_ALPHA | _CHAR_DIGIT:
+        return 'reference_code'
+    # If it's just letters, it's a text identifier
+    if flags == _CHAR_ALPHA:
+        return 'text'
+        
+    # Default to 'custom' for anything that doesn't match above patterns
+    return 'custom'
+
 
 def admin_only(func):
     """Decorator to restrict access to admin users only."""
@@ -43,30 +144,59 @@ class AIVABot:
         self.token = token
         self.start_time = datetime.now()
         self.self_ping_url = os.getenv('SELF_PING_URL')
+        # Admin IDs, parsed once for O(1) membership checks and notifications
+        self._admin_ids = get_settings().ADMIN_IDS
+        # Identifiers currently being monitored; checked before touching the database
+        self._active_ids: set[str] = set()
+        # Pending (model, row) inserts, written in batches by _batch_writer
+        self._write_q: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        # Long-lived HTTP session for self-ping, created in post_init
+        self._http_session: Optional[aiohttp.ClientSession] = None
         self.application = (
             Application.builder()
             .token(token)
+            # Larger pool so alert bursts don't queue behind one connection
+            .connection_pool_size(64)
+            .pool_timeout(20)
+            .get_updates_connection_pool_size(4)
+            # Back off outbound sends instead of hitting Telegram's flood limits
+            .rate_limiter(AIORateLimiter(
+                overall_max_rate=25,
+                overall_time_period=1,
+                group_max_rate=18,
+                group_time_period=60
+            ))
             .post_init(self.post_init)
+            .post_shutdown(self.post_shutdown)
             .build()
         )
         self._setup_handlers()
         logger.info("Bot initialized")
-        
-        # Initialize database
+
+    async def post_init(self, application: Application) -> None:
+        """Post-initialization hook."""
+        # Create the schema in a worker thread while the bot commands are registered
         try:
-            init_db()
+            await asyncio.gather(self.setup_commands(), asyncio.to_thread(init_db))
             logger.info("Database initialized")
         except Exception as e:
             logger.error(f"Failed to initialize database: {e}")
             raise
-
-    async def post_init(self) -> None:
-        """Post-initialization hook."""
-        await self.setup_commands()
+        await self._load_active_ids()
+        
+        # Start the background writer for batched inserts
+        self._write_q = asyncio.Queue()
+        self._writer_task = asyncio.create_task(self._batch_writer())
         
         # Add job queue for self-ping
         self.job_queue = self.application.job_queue
         if self.job_queue and self.self_ping_url:
+            # Reuse one session so keep-alive spares a TCP/TLS handshake per ping
+            self._http_session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=10),  # 10 second timeout
+                connector=aiohttp.TCPConnector(limit=4, ttl_dns_cache=300)
+            )
             # Run self-ping every 5 minutes, starting 10 seconds after bot starts
             self.job_queue.run_repeating(
                 self.self_ping, 
@@ -83,9 +213,85 @@ class AIVABot:
             
         logger.info("Bot post-initialization complete")
 
+    async def post_shutdown(self, application: Application) -> None:
+        """Post-shutdown hook."""
+        # Let the writer drain everything queued ahead of the stop marker
+        if self._writer_task:
+            self._write_q.put_nowait(None)
+            await self._writer_task
+        
+        if self._http_session:
+            await self._http_session.close()
+        
+        await close_db_connection()
+        
+        logger.info("Bot shutdown complete")
+
+    def _queue_insert(self, model, row: Dict[str, Any]) -> None:
+        """Queue a row for insertion by the background writer."""
+        self._write_q.put_nowait((model, row))
+
+    async def _batch_writer(self) -> None:
+        """Collect queued inserts and write them to the database in batches.
+        
+        A queued None stops the writer once everything before it is written.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._write_q.get()]
+            deadline = loop.time() + _WRITE_BATCH_DELAY
+            while len(batch) < _WRITE_BATCH_SIZE and batch[-1] is not None:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._write_q.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            stopping = batch[-1] is None
+            if stopping:
+                batch.pop()
+            if batch:
+                await self._flush_writes(batch)
+            if stopping:
+                return
+
+    async def _flush_writes(self, batch: List[tuple]) -> None:
+        """Insert a batch of queued rows with one executemany per table and a single commit."""
+        rows_by_model: Dict[Any, List[Dict[str, Any]]] = {}
+        for model, row in batch:
+            rows_by_model.setdefault(model, []).append(row)
+        
+        try:
+            async with get_db() as db:
+                for model, rows in rows_by_model.items():
+                    if model is IdentifierRecord:
+                        # Identifiers that already exist are skipped rather than failing the batch
+                        await bulk_insert_identifiers(db, rows)
+                    else:
+                        await db.execute(model.__table__.insert(), rows)
+            logger.debug(f"Flushed {len(batch)} queued inserts")
+        except Exception as e:
+            logger.error(f"Failed to write {len(batch)} queued inserts: {e}", exc_info=True)
+            # Identifiers that never made it to the database are not monitored
+            for row in rows_by_model.get(IdentifierRecord, []):
+                self._active_ids.discard(row['identifier'])
+
+    async def _load_active_ids(self) -> None:
+        """Load all monitored identifiers into the in-memory lookup set."""
+        async with get_db() as db:
+            result = await db.execute(
+                select(IdentifierRecord.identifier).where(
+                    IdentifierRecord.is_duplicate == False
+                )
+            )
+            self._active_ids = set(result.scalars())
+        logger.info(f"Loaded {len(self._active_ids)} monitored identifiers")
+
     def is_admin(self, user_id: int) -> bool:
         """Check if a user is an admin."""
-        return user_id in settings.admin_ids_list
+        return user_id in self._admin_ids
 
     async def setup_commands(self) -> None:
         """Set up bot commands."""
@@ -157,7 +363,7 @@ class AIVABot:
             r"• /help \- Show this help message\n"
             r"• /add \<identifier\> \- Add any identifier to monitor \[text, numbers, codes, etc\.\]\n"
             r"• /add\_identifier \<identifier\> \- Same as /add\n"
-            r"• /list \- List all monitored identifiers\n"
+            r"• /list \[page\] \- List monitored identifiers, 50 per page\n"
             r"• /list\_data \- Same as /list\n"
             r"• /status \- Show bot status and statistics"
         )
@@ -181,44 +387,7 @@ class AIVABot:
         Determine the type of identifier based on its format.
         Returns a string describing the identifier type.
         """
-        # Remove any whitespace for type detection
-        clean_identifier = ''.join(identifier.split())
-        
-        # Check for empty string
-        if not clean_identifier:
-            return 'unknown'
-            
-        # Check for email
-        if '@' in clean_identifier and '.' in clean_identifier.split('@')[-1]:
-            return 'email'
-            
-        # Check if it's all digits (could be phone, account number, etc.)
-        if clean_identifier.isdigit():
-            length = len(clean_identifier)
-            if 8 <= length <= 15:
-                return 'phone'
-            elif 16 <= length <= 20:
-                return 'account_number'
-            elif length > 20:
-                return 'large_number'
-            return 'numeric'
-            
-        # Check for alphanumeric with special characters (common in reference codes)
-        if any(c.isalnum() for c in clean_identifier):
-            # If it contains both letters and numbers, it's likely a reference code
-            if any(c.isalpha() for c in clean_identifier) and any(c.isdigit() for c in clean_identifier):
-                return 'reference_code'
-            # If it's just letters, it's a text identifier
-            elif clean_identifier.isalpha():
-                return 'text'
-                
-        # Check for UUID format
-        uuid_pattern = r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$'
-        if re.match(uuid_pattern, clean_identifier.lower()):
-            return 'uuid'
-            
-        # Default to 'custom' for anything that doesn't match above patterns
-        return 'custom'
+        return _classify_identifier(identifier)
 
     async def add_identifier(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Add a new identifier to monitor. Accepts any string value as an identifier."""
@@ -229,51 +398,48 @@ class AIVABot:
             )
             return
             
-        identifier = ' '.join(context.args).strip()
+        identifier = normalize_identifier(' '.join(context.args))
         if not identifier:
             await update.message.reply_text(r"❌ Identifier cannot be empty.")
             return
-            
+        if len(identifier) > _MAX_IDENTIFIER_LENGTH:
+            await update.message.reply_text(
+                f"❌ Identifier is too long (max {_MAX_IDENTIFIER_LENGTH} characters)."
+            )
+            return
+
         # No need to validate format - accept any string
         identifier_type = self.determine_identifier_type(identifier)
         
         try:
-            with get_db() as db:
-                # Check if identifier already exists
-                existing = db.query(IdentifierRecord).filter(
-                    IdentifierRecord.identifier == identifier,
-                    IdentifierRecord.is_duplicate == False
-                ).first()
-                
-                if existing:
-                    await update.message.reply_text(
-                        r"⚠️ This identifier is already being monitored."
-                    )
-                    return
-                
-                # Create new record
-                new_record = IdentifierRecord(
-                    identifier=identifier,
-                    identifier_type=identifier_type,
-                    user_id=update.effective_user.id,
-                    is_duplicate=False
-                )
-                
-                db.add(new_record)
-                db.commit()
-                
-                # Escape markdown special characters in the identifier
-                escaped_identifier = self.escape_markdown_v2(identifier)
-                
+            # Check if identifier already exists
+            if identifier in self._active_ids:
                 await update.message.reply_text(
-                    fr"✅ Successfully added identifier: `{escaped_identifier}`\n"
-                    fr"Type: `{identifier_type.upper() if identifier_type else 'UNKNOWN'}`",
-                    parse_mode='MarkdownV2',
-                    disable_web_page_preview=True
+                    r"⚠️ This identifier is already being monitored."
                 )
-                
-                # Log the addition
-                logger.info(f"New identifier added: {identifier} (Type: {identifier_type}) by user {update.effective_user.id}")
+                return
+            
+            # Queue the new record; the background writer commits it shortly
+            self._queue_insert(IdentifierRecord, {
+                'identifier': identifier,
+                'identifier_type': identifier_type,
+                'user_id': update.effective_user.id,
+                'is_duplicate': False,
+            })
+            self._active_ids.add(identifier)
+            
+            # Escape markdown special characters in the identifier
+            escaped_identifier = self.escape_markdown_v2(identifier)
+            
+            await update.message.reply_text(
+                fr"✅ Successfully added identifier: `{escaped_identifier}`\n"
+                fr"Type: `{identifier_type.upper() if identifier_type else 'UNKNOWN'}`",
+                parse_mode='MarkdownV2',
+                disable_web_page_preview=True
+            )
+            
+            # Log the addition
+            logger.info(f"New identifier added: {identifier} (Type: {identifier_type}) by user {update.effective_user.id}")
                 
         except Exception as e:
             logger.error(f"Error in add_identifier: {e}", exc_info=True)
@@ -283,50 +449,73 @@ class AIVABot:
             )
 
     async def list_identifiers(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-        """List all monitored identifiers."""
+        """List monitored identifiers, one page at a time (e.g. `/list 2`)."""
+        page = 1
+        if context.args:
+            try:
+                page = max(1, int(context.args[0]))
+            except ValueError:
+                await update.message.reply_text(r"❌ Invalid page number. Example: /list 2")
+                return
+        
         try:
-            with get_db() as db:
-                # Get all non-duplicate identifiers
-                records = db.query(IdentifierRecord).filter(
-                    IdentifierRecord.is_duplicate == False
-                ).order_by(IdentifierRecord.created_at.desc()).all()
-                
-                if not records:
-                    await update.message.reply_text("No identifiers are currently being monitored.")
-                    return
+            async with get_db() as db:
+                active = IdentifierRecord.is_duplicate == False
+                total = await db.scalar(
+                    select(func.count(IdentifierRecord.id)).where(active)
+                )
                 
-                # Format the response
-                response = [r"*📋 Monitored Identifiers*\n\n"]
-                for i, record in enumerate(records, 1):
-                    # Escape all dynamic content
-                    escaped_identifier = self.escape_markdown_v2(record.identifier)
-                    escaped_type = self.escape_markdown_v2(record.identifier_type.upper() if record.identifier_type else 'UNKNOWN')
-                    added_date = record.created_at.strftime('%Y-%m-%d %H:%M')
+                if total:
+                    total_pages = (total + _LIST_PAGE_SIZE - 1) // _LIST_PAGE_SIZE
+                    page = min(page, total_pages)
+                    offset = (page - 1) * _LIST_PAGE_SIZE
                     
-                    response.append(
-                        fr"{i}\. `{escaped_identifier}`\n"
-                        fr"   *Type:* `{escaped_type}`\n"
-                        fr"   *Added:* `{added_date}`\n"
-                        fr"   *ID:* `{record.id}`"
-                    )
+                    # Only fetch the rows for the requested page
+                    records = (await db.scalars(
+                        select(IdentifierRecord).where(active).order_by(
+                            IdentifierRecord.created_at.desc()
+                        ).limit(_LIST_PAGE_SIZE).offset(offset)
+                    )).all()
+            
+            # Reply after the session is closed so no connection is held while sending
+            if not total:
+                await update.message.reply_text("No identifiers are currently being monitored.")
+                return
+            
+            # Format the response, sending a message whenever the buffer fills up
+            # so entries are never split across Telegram's message length limit
+            buf = io.StringIO()
+            buf.write(fr"*📋 Monitored Identifiers* \(page {page}/{total_pages}, {total} total\)\n\n")
+            for i, record in enumerate(records, start=offset + 1):
+                # Escape all dynamic content
+                escaped_identifier = self.escape_markdown_v2(record.identifier)
+                escaped_type = self.escape_markdown_v2(record.identifier_type.upper() if record.identifier_type else 'UNKNOWN')
+                added_date = record.created_at.strftime('%Y-%m-%d %H:%M')
                 
-                # Split long messages to avoid hitting Telegram's message length limit
-                message = "\n\n".join(response)
-                if len(message) > 4000:
-                    # Split into multiple messages
-                    chunks = [message[i:i+4000] for i in range(0, len(message), 4000)]
-                    for chunk in chunks:
-                        await update.message.reply_text(
-                            chunk,
-                            parse_mode='MarkdownV2',
-                            disable_web_page_preview=True
-                        )
-                else:
+                entry = (
+                    fr"{i}\. `{escaped_identifier}`\n"
+                    fr"   *Type:* `{escaped_type}`\n"
+                    fr"   *Added:* `{added_date}`\n"
+                    fr"   *ID:* `{record.id}`"
+                )
+                
+                if buf.tell() + len(entry) > _MESSAGE_CHUNK_SIZE:
                     await update.message.reply_text(
-                        message,
+                        buf.getvalue(),
                         parse_mode='MarkdownV2',
                         disable_web_page_preview=True
                     )
+                    buf = io.StringIO()
+                elif buf.tell():
+                    buf.write("\n\n")
+                buf.write(entry)
+            
+            if buf.tell():
+                await update.message.reply_text(
+                    buf.getvalue(),
+                    parse_mode='MarkdownV2',
+                    disable_web_page_preview=True
+                )
                         
         except Exception as e:
             logger.error(f"Error in list_identifiers: {e}", exc_info=True)
@@ -348,12 +537,13 @@ class AIVABot:
             
         try:
             record_id = int(context.args[0])
-            with get_db() as db:
+            async with get_db() as db:
                 # Find and delete the record
-                record = db.query(IdentifierRecord).get(record_id)
+                record = await db.get(IdentifierRecord, record_id)
                 if record:
-                    db.delete(record)
-                    db.commit()
+                    await db.delete(record)
+                    await db.commit()
+                    self._active_ids.discard(record.identifier)
                     await update.message.reply_text(
                         fr"✅ Successfully removed identifier: `{record.identifier}`",
                         parse_mode='Markdown'
@@ -374,10 +564,8 @@ class AIVABot:
         """Escape special characters for MarkdownV2."""
         if not text:
             return ""
-        # Define all special characters that need to be escaped in MarkdownV2
-        escape_chars = r'_*[]()~`>#+-=|{}.!'
-        # Use a list comprehension to build the escaped string
-        return ''.join(f'\{char}' if char in escape_chars else char for char in text)
+        # PTB's helper escapes the full MarkdownV2 character set in one pass
+        return escape_markdown(text, version=2)
 
     def extract_identifiers(self, text: str) -> list[str]:
         """Extract potential identifiers from a message text."""
@@ -388,15 +576,18 @@ class AIVABot:
         separators = r'[\s\n\t\r,;|]+'
         potential = []
         
-        # First, check the entire message as-is
-        potential.append(text.strip())
+        # First, check the entire message as-is, unless it's too long to be stored
+        whole = normalize_identifier(text)
+        if len(whole) <= _MAX_IDENTIFIER_LENGTH:
+            potential.append(whole)
         
         # Then check individual parts
         parts = re.split(separators, text)
         for part in parts:
             part = part.strip()
             # Only consider parts that look like potential identifiers
-            if len(part) >= 6:  # Minimum length to avoid too many false positives
+            # (minimum length to avoid too many false positives)
+            if 6 <= len(part) <= _MAX_IDENTIFIER_LENGTH:
                 potential.append(part)
         
         # Remove duplicates while preserving order
@@ -415,26 +606,33 @@ class AIVABot:
             # Ignore commands (they're handled by command handlers)
             if text.startswith('/'):
                 return
+            
+            # Nothing can match while no identifiers are being monitored
+            if not self._active_ids:
+                return
                 
             # Extract potential identifiers from the message
             potential_identifiers = self.extract_identifiers(text)
             found_duplicates = False
             
-            for identifier in potential_identifiers:
-                if not identifier.strip():
-                    continue
-                    
-                with get_db() as db:
-                    # Check if this identifier exists in our database
-                    existing = db.query(IdentifierRecord).filter(
-                        IdentifierRecord.identifier == identifier,
-                        IdentifierRecord.is_duplicate == False
-                    ).first()
-                    
+            # Only hit the database for identifiers we know are monitored
+            candidates = [i for i in potential_identifiers if i.strip() and i in self._active_ids]
+            
+            if candidates:
+                async with get_db() as db:
+                    # Look all candidates up in one query, fetching only the
+                    # columns handle_duplicate needs
+                    matches = await find_identifiers(db, candidates)
+                
+                for identifier in candidates:
+                    existing = matches.get(identifier)
                     if existing:
-                        # This is a duplicate!
+                        # This is a duplicate! Alert without blocking this handler
                         found_duplicates = True
-                        await self.handle_duplicate(existing, identifier, message, context.bot, db, context)
+                        context.application.create_task(
+                            self.handle_duplicate(existing, identifier, message, context.bot, context),
+                            update=update
+                        )
             
             # If we didn't find any duplicates, log that we processed the message
             if not found_duplicates:
@@ -451,35 +649,19 @@ class AIVABot:
             except Exception as e2:
                 logger.error(f"Failed to send error message: {e2}")
 
-    async def handle_duplicate(self, existing_record, identifier: str, message: Message, bot, db: Session, context: ContextTypes.DEFAULT_TYPE) -> None:
+    async def handle_duplicate(self, existing_record, identifier: str, message: Message, bot, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Handle a detected duplicate identifier."""
         logger.info(f"handle_duplicate: identifier={identifier}, chat_id={message.chat.id if hasattr(message, 'chat') and message.chat else None}")
         
         try:
-            # Start a new nested transaction that we can roll back on error
-            db.begin_nested()
-            
-            try:
-                # Instead of creating a new record, we'll use the existing one
-                # but still create an alert to track the duplicate detection
-                
-                # Create the duplicate alert
-                alert = DuplicateAlert(
-                    identifier=identifier,
-                    original_id=existing_record.id,
-                    status='pending'
-                )
-                
-                db.add(alert)
-                db.commit()
-                logger.info(f"Successfully created duplicate alert for identifier: {identifier}")
-                
-            except Exception as e:
-                # If anything goes wrong, roll back the nested transaction
-                db.rollback()
-                logger.error(f"Error creating duplicate alert for {identifier}: {e}", exc_info=True)
-                # Re-raise to be caught by the outer exception handler
-                raise
+            # Instead of creating a new record, we'll use the existing one
+            # but still queue an alert to track the duplicate detection
+            self._queue_insert(DuplicateAlert, {
+                'identifier': identifier,
+                'original_id': existing_record.id,
+                'status': 'pending',
+            })
+            logger.info(f"Queued duplicate alert for identifier: {identifier}")
             
             # Get identifier type from the existing record
             identifier_type = existing_record.identifier_type or self.determine_identifier_type(identifier)
@@ -495,15 +677,12 @@ class AIVABot:
             first_seen = existing_record.created_at.strftime('%Y-%m-%d %H:%M')
             
             # Format the alert message with MarkdownV2
-            alert_text = (
-                "*🚨 DUPLICATE IDENTIFIER DETECTED 🚨*\n\n"
-                f"⚠️ *TYPE\:* `{escaped_type}`\n"
-                f"🔑 *Identifier\:* `{escaped_identifier}`\n"
-                f"📅 *First Seen\:* `{first_seen}`\n"
-                f"👤 *Reported by\:* {escaped_username}\n\n"
-                "*Please verify this transaction before proceeding\!*\n"
-                "_This identifier has been previously processed\._"
-            )
+            alert_text = _ALERT_TEMPLATE.format_map({
+                'type': escaped_type,
+                'identifier': escaped_identifier,
+                'first_seen': first_seen,
+                'user': escaped_username,
+            })
             
             # Try to send the alert as a reply to the original message
             try:
@@ -560,23 +739,15 @@ class AIVABot:
             message: The message to send
             use_markdown: Whether to parse the message as MarkdownV2
         """
-        if not hasattr(settings, 'admin_ids_list'):
-            logger.error("ADMIN_IDS not properly configured in settings")
-            return
-            
-        admin_ids = settings.admin_ids_list
+        admin_ids = self._admin_ids
         if not admin_ids:
             logger.warning("No admin IDs configured in ADMIN_IDS")
             return
-            
-        for admin_id in admin_ids:
-            if not admin_id or not str(admin_id).isdigit():
-                logger.warning(f"Skipping invalid admin ID: {admin_id}")
-                continue
-                
+        
+        async def send(admin_id: int) -> None:
             try:
                 await bot.send_message(
-                    chat_id=int(admin_id),
+                    chat_id=admin_id,
                     text=message,
                     parse_mode='Markdown',
                     disable_web_page_preview=True
@@ -587,54 +758,66 @@ class AIVABot:
                     logger.warning(f"Admin chat not found (ID: {admin_id}). They may need to start a chat with the bot first.")
                 else:
                     logger.error(f"Failed to notify admin {admin_id}: {e}")
+        
+        # Send to all admins concurrently rather than one round-trip at a time
+        await asyncio.gather(*(send(admin_id) for admin_id in admin_ids))
 
     async def status(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Show bot status and statistics."""
         try:
-            with get_db() as db:
-                # Get counts from database
-                total_identifiers = db.query(IdentifierRecord).count()
-                unique_identifiers = db.query(IdentifierRecord).filter(
-                    IdentifierRecord.is_duplicate == False
-                ).count()
-                duplicates = total_identifiers - unique_identifiers
-                
-                # Get uptime
-                uptime = datetime.now() - self.start_time
-                days, seconds = uptime.days, uptime.seconds
-                hours = seconds // 3600
-                minutes = (seconds % 3600) // 60
+            async with get_db() as db:
+                # Get counts from database in a single aggregate query
+                total_identifiers, unique_identifiers = (await db.execute(
+                    select(
+                        func.count(IdentifierRecord.id),
+                        func.sum(case((IdentifierRecord.is_duplicate == False, 1), else_=0))
+                    )
+                )).one()
                 
                 # Get counts by identifier type
-                type_counts = db.query(
-                    IdentifierRecord.identifier_type,
-                    func.count(IdentifierRecord.id)
-                ).filter(
-                    IdentifierRecord.is_duplicate == False
-                ).group_by(IdentifierRecord.identifier_type).all()
-                
-                # Format type counts
-                type_counts_text = "\n".join(
-                    f"• {t[0].upper() if t[0] else 'UNKNOWN'}: {t[1]}" 
-                    for t in sorted(type_counts, key=lambda x: x[1], reverse=True)
-                )
-                
-                status_text = (
-                    "🤖 *Bot Status*\n\n"
-                    f"• *Uptime:* {days}d {hours}h {minutes}m\n"
-                    f"• *Self-ping:* {'✅ Active' if self.self_ping_url else '❌ Inactive'}\n\n"
-                    f"📊 *Statistics*\n"
-                    f"• *Total Identifiers:* {total_identifiers}\n"
-                    f"• *Unique Identifiers:* {unique_identifiers}\n"
-                    f"• *Duplicates Detected:* {duplicates}\n\n"
-                    f"📝 *Identifier Types*\n{type_counts_text}"
-                )
-                
-                await update.message.reply_text(
-                    status_text,
-                    parse_mode='Markdown',
-                    disable_web_page_preview=True
-                )
+                type_counts = (await db.execute(
+                    select(
+                        IdentifierRecord.identifier_type,
+                        func.count(IdentifierRecord.id)
+                    ).where(
+                        IdentifierRecord.is_duplicate == False
+                    ).group_by(
+                        IdentifierRecord.identifier_type
+                    ).order_by(func.count(IdentifierRecord.id).desc())
+                )).all()
+            
+            # Format and reply after the session is closed so no connection is held while sending
+            unique_identifiers = unique_identifiers or 0
+            duplicates = total_identifiers - unique_identifiers
+            
+            # Get uptime
+            uptime = datetime.now() - self.start_time
+            days, seconds = uptime.days, uptime.seconds
+            hours = seconds // 3600
+            minutes = (seconds % 3600) // 60
+            
+            # Format type counts
+            type_counts_text = "\n".join(
+                f"• {t[0].upper() if t[0] else 'UNKNOWN'}: {t[1]}" 
+                for t in type_counts
+            )
+            
+            status_text = (
+                "🤖 *Bot Status*\n\n"
+                f"• *Uptime:* {days}d {hours}h {minutes}m\n"
+                f"• *Self-ping:* {'✅ Active' if self.self_ping_url else '❌ Inactive'}\n\n"
+                f"📊 *Statistics*\n"
+                f"• *Total Identifiers:* {total_identifiers}\n"
+                f"• *Unique Identifiers:* {unique_identifiers}\n"
+                f"• *Duplicates Detected:* {duplicates}\n\n"
+                f"📝 *Identifier Types*\n{type_counts_text}"
+            )
+            
+            await update.message.reply_text(
+                status_text,
+                parse_mode='Markdown',
+                disable_web_page_preview=True
+            )
                 
         except Exception as e:
             logger.error(f"Error in status: {e}", exc_info=True)
@@ -644,38 +827,31 @@ class AIVABot:
 
     async def self_ping(self, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Ping the self-ping URL to keep the bot alive."""
-        if not self.self_ping_url:
+        if not self.self_ping_url or not self._http_session:
             logger.warning("Self-ping URL not configured")
             return
             
         logger.info(f"Performing self-ping to {self.self_ping_url}")
         try:
-            timeout = aiohttp.ClientTimeout(total=10)  # 10 second timeout
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.get(self.self_ping_url) as response:
+            # HEAD is enough to keep the service awake; no body needs to be downloaded
+            async with self._http_session.head(self.self_ping_url, allow_redirects=True) as response:
+                status = response.status
+            if status == 405:
+                # Server doesn't allow HEAD, fall back to GET without reading the body
+                async with self._http_session.get(self.self_ping_url) as response:
                     status = response.status
-                    text = await response.text()
-                    if status == 200:
-                        logger.info(f"Self-ping successful: {status} - {text[:100]}")
-                    else:
-                        logger.warning(f"Self-ping failed with status {status}: {text[:200]}")
+            if status == 200:
+                logger.info(f"Self-ping successful: {status}")
+            else:
+                logger.warning(f"Self-ping failed with status {status}")
         except asyncio.TimeoutError:
             logger.error("Self-ping request timed out after 10 seconds")
         except aiohttp.ClientError as e:
             logger.error(f"HTTP error during self-ping: {str(e)}")
         except Exception as e:
-            logger.error(f"Unexpected error in self_ping: {e}", exc_info=True)
-            # Try to restart the job if it fails
-            try:
-                if self.job_queue:
-                    self.job_queue.run_repeating(
-                        self.self_ping,
-                        interval=300.0,
-                        first=60.0,  # Try again in 1 minute
-                        name="self_ping_retry"
-                    )
-            except Exception as restart_error:
-                logger.error(f"Failed to restart self-ping job: {restart_error}")
+            # Full tracebacks only at DEBUG; this can fire every tick during an outage
+            logger.error("Unexpected error in self_ping: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
+            # No restart needed: the repeating job simply tries again on its next tick
 
     async def error_handler(self, update: object, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Handle errors in the telegram.ext application with detailed logging."""
@@ -685,24 +861,36 @@ class AIVABot:
             exc_info=context.error
         )
         
+        # Render the update once and truncate it, instead of repr()-ing it per use
+        update_repr = _ERR_REPR.repr(update) if update else 'None'
+        
         # Try to get more context about the error
         error_info = {
             'error': str(context.error),
             'error_type': context.error.__class__.__name__,
-            'update': str(update)[:500] if update else 'None',  # Limit length
+            'update': update_repr,
             'user_data': str(context.user_data)[:200] if context.user_data else '{}',
             'chat_data': str(context.chat_data)[:200] if context.chat_data else '{}'
         }
         
         logger.error(f"Error context: {error_info}")
         
+        # Admins already see the in-chat reply, so don't ping them a second time
+        user = getattr(update, 'effective_user', None)
+        from_admin = bool(user) and self.is_admin(user.id)
+        
         try:
             # Try to reply to the message that caused the error
+            replied = False
             if update and hasattr(update, 'message') and update.message:
                 await update.message.reply_text(
                     text="❌ An error occurred while processing your request. The admin has been notified.",
                     parse_mode='Markdown'
                 )
+                replied = True
+            
+            if from_admin and replied:
+                return
                 
             # Notify all admins about the error
             admin_message = (
@@ -713,8 +901,8 @@ class AIVABot:
             
             # Truncate the update info to avoid message too long errors
             if update:
-                update_info = str(update)[:150]
-                if len(str(update)) > 150:
+                update_info = update_repr[:150]
+                if len(update_repr) > 150:
                     update_info += '...'
                 admin_message += f"\n\n*Update:* `{update_info}`"
             
@@ -726,62 +914,46 @@ class AIVABot:
             try:
                 logger.error(f"Original error: {str(context.error)}")
                 if update:
-                    logger.error(f"Update that caused error: {str(update)[:500]}")
+                    logger.error(f"Update that caused error: {update_repr}")
             except Exception as log_err:
                 logger.error(f"Failed to log error details: {log_err}")
 
 
+# Bot token is fixed for the lifetime of the process, so read it once at import
+_TOKEN = os.getenv('BOT_TOKEN')
+_APP: Optional[Application] = None
+
+
 def get_application() -> Application:
-    """Create and configure the Telegram application."""
-    token = os.getenv('BOT_TOKEN')
-    if not token:
-        raise ValueError("BOT_TOKEN environment variable is not set")
+    """Create and configure the Telegram application.
     
-    bot = AIVABot(token)
-    return bot.application
+    The application is built once and reused on subsequent calls.
+    """
+    global _APP
+    if _APP is None:
+        if not _TOKEN:
+            raise ValueError("BOT_TOKEN environment variable is not set")
+        _APP = AIVABot(_TOKEN).application
+    return _APP
 
 
-async def setup_webhook(application, webhook_url: str, secret_token: str) -> None:
-    """Set up the webhook with the given URL and secret token."""
-    await application.bot.set_webhook(
-        url=webhook_url,
-        secret_token=secret_token,
-        drop_pending_updates=True,
-        allowed_updates=Update.ALL_TYPES
-    )
-    logger.info("Webhook set successfully")
+def _reset_application() -> None:
+    """Drop the cached application so the next call builds a fresh one."""
+    global _APP
+    _APP = None
 
-async def run_webhook(application, port: int, webhook_url: str, secret_token: str) -> None:
-    """Run the application in webhook mode."""
-    await application.initialize()
-    await setup_webhook(application, webhook_url, secret_token)
-    await application.start()
-    
-    # Start the webhook server
-    await application.updater.start_webhook(
-        listen="0.0.0.0",
-        port=port,
-        url_path="",
-        webhook_url=webhook_url,
-        secret_token=secret_token,
-        drop_pending_updates=True,
-        allowed_updates=Update.ALL_TYPES
-    )
-    logger.info("Bot is running in webhook mode")
-    
-    # Keep the application running
-    while True:
-        await asyncio.sleep(3600)  # Sleep for 1 hour
 
 def run_polling_mode(application: Application):
     """Run the bot in polling mode for development."""
     logger.info("Starting in POLLING mode")
     application.run_polling(
         drop_pending_updates=True,
-        allowed_updates=Update.ALL_TYPES
+        allowed_updates=_ALLOWED_UPDATES,
+        poll_interval=0.0,
+        timeout=50  # Long-poll so an idle bot makes few getUpdates calls
     )
 
-async def run_webhook_mode(application: Application):
+def run_webhook_mode(application: Application):
     """Configure and run the bot in webhook mode for production."""
     port = int(os.getenv('PORT', 10000))
     webhook_url = os.getenv('WEBHOOK_URL')
@@ -800,30 +972,62 @@ async def run_webhook_mode(application: Application):
     logger.info(f"Starting in WEBHOOK mode on port {port}")
     logger.info(f"Webhook URL: {webhook_url}")
     
-    await run_webhook(application, port, webhook_url, secret_token)
+    # PTB registers the webhook, starts the server and parks on a stop event until
+    # one of these signals arrives (Render sends SIGTERM on redeploy)
+    application.run_webhook(
+        stop_signals=(signal.SIGINT, signal.SIGTERM, signal.SIGABRT),
+        listen="0.0.0.0",
+        port=port,
+        url_path="",
+        webhook_url=webhook_url,
+        secret_token=secret_token,
+        drop_pending_updates=True,
+        allowed_updates=_ALLOWED_UPDATES,
+        # Let Telegram deliver bursts over more parallel connections (its default is 40)
+        max_connections=int(os.getenv('WEBHOOK_MAX_CONN', 100))
+    )
+
+def install_uvloop() -> None:
+    """Use uvloop for the event loop if it's enabled and installed."""
+    if not ('RENDER' in os.environ or os.getenv('USE_UVLOOP', '').lower() == 'true'):
+        return
+    try:
+        import uvloop
+    except ImportError:
+        logger.warning("uvloop not installed, using the default asyncio event loop")
+        return
+    uvloop.install()
+    # Start from a fresh loop so the uvloop policy is the one PTB picks up
+    asyncio.set_event_loop(asyncio.new_event_loop())
+    logger.info("Using uvloop event loop")
+
+def configure_logging() -> None:
+    """Configure logging once for the whole process (console and rotating log file)."""
+    settings = get_settings()
+    logging.basicConfig(
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        level=settings.LOG_LEVEL,
+        handlers=[
+            RotatingFileHandler(settings.LOG_FILE, maxBytes=10_000_000, backupCount=3),
+            logging.StreamHandler(),
+        ]
+    )
 
 def main():
     """Start the bot."""
-    try:
+    configure_logging()
+    
+    # `python bot.py --init-schema` creates the database schema and exits
+    if '--init-schema' in sys.argv[1:]:
         init_db()
-        logger.info("Database initialized")
-    except Exception as e:
-        logger.error(f"Failed to initialize database: {e}")
-        raise
+        logger.info("Database schema initialized")
+        return
     
     application = get_application()
     
     if 'RENDER' in os.environ or os.getenv('WEBHOOK_MODE', '').lower() == 'true':
-        loop = asyncio.get_event_loop()
-        try:
-            loop.run_until_complete(run_webhook_mode(application))
-        except KeyboardInterrupt:
-            logger.info("Shutting down...")
-            # Graceful shutdown
-            if loop.is_running():
-                loop.run_until_complete(application.stop())
-                loop.run_until_complete(application.shutdown())
-            loop.close()
+        install_uvloop()
+        run_webhook_mode(application)
     else:
         run_polling_mode(application)
 
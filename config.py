@@ -1,58 +1,69 @@
 import os
+from functools import cached_property, lru_cache
 from pathlib import Path
 from dotenv import load_dotenv
-from typing import List, Optional
-from pydantic import validator
-from pydantic_settings import BaseSettings
+from typing import Annotated, FrozenSet, List, Optional, Union
+from pydantic import field_validator
+from pydantic_settings import BaseSettings, NoDecode, SettingsConfigDict
 
-# Load environment variables from .env file
-env_path = Path('.') / '.env'
-load_dotenv(dotenv_path=env_path)
+# Load environment variables from .env file (set SKIP_DOTENV=1 to rely on the real environment)
+_SKIP_DOTENV = os.getenv('SKIP_DOTENV') == '1'
+if not _SKIP_DOTENV:
+    env_path = Path('.') / '.env'
+    load_dotenv(dotenv_path=env_path)
 
 class Settings(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_file='.env',
+        env_file_encoding='utf-8',
+        case_sensitive=True,
+        extra='ignore',
+        env_ignore_empty=True,  # Empty values (e.g. DEBUG=) fall back to the defaults
+    )
+    
     # Application
     APP_NAME: str = "AIVA Detect System"
-    DEBUG: bool = os.getenv('DEBUG', 'False').lower() in ('true', '1', 't')
+    DEBUG: bool = False
     
     # Telegram
-    BOT_TOKEN: str = os.getenv('BOT_TOKEN', '')
+    BOT_TOKEN: str = ''
     
-    # Parse ADMIN_IDS from environment variable
-    ADMIN_IDS: str = '1'  # Store as string to avoid JSON parsing
+    # Comma-separated in the environment; NoDecode skips JSON parsing
+    ADMIN_IDS: Annotated[FrozenSet[int], NoDecode] = frozenset({1})
     
-    @property
-    def admin_ids_list(self) -> List[int]:
-        """Get admin IDs as a list of integers."""
-        if not self.ADMIN_IDS.strip():
-            return [1]  # Default to admin ID 1 if empty
-        if self.ADMIN_IDS.strip().isdigit():
-            return [int(self.ADMIN_IDS.strip())]  # Single number
-        # Comma-separated list
-        return [int(x.strip()) for x in self.ADMIN_IDS.split(',') if x.strip().isdigit()] or [1]
+    @field_validator('ADMIN_IDS', mode='before')
+    @classmethod
+    def parse_admin_ids(cls, value: Union[str, List[int], FrozenSet[int]]) -> FrozenSet[int]:
+        """Parse ADMIN_IDS from a comma-separated string or a list of ints."""
+        if isinstance(value, str):
+            ids = frozenset(int(x.strip()) for x in value.split(',') if x.strip().isdigit())
+        else:
+            ids = frozenset(int(x) for x in value)
+        return ids or frozenset({1})  # Default to admin ID 1 if empty
     
     # Database
-    DATABASE_DIR: str = os.getenv('DATABASE_DIR', 'instance')
-    DATABASE_FILENAME: str = os.getenv('DATABASE_FILENAME', 'aiva_detect.db')
+    DATABASE_DIR: str = 'instance'
+    DATABASE_FILENAME: str = 'aiva_detect.db'
     
-    @property
+    @cached_property
     def DATABASE_URL(self) -> str:
-        """Get the database URL, ensuring the directory exists."""
+        """Get the database URL, ensuring the directory exists (computed once)."""
         # Create the database directory if it doesn't exist
         os.makedirs(self.DATABASE_DIR, exist_ok=True)
         # Return the full path to the SQLite database file
         return f"sqlite:///{os.path.join(self.DATABASE_DIR, self.DATABASE_FILENAME)}"
     
     # Logging
-    LOG_LEVEL: str = os.getenv('LOG_LEVEL', 'INFO')
+    LOG_LEVEL: str = 'INFO'
     LOG_FILE: str = 'logs/aiva_bot.log'
-    
-    class Config:
-        env_file = '.env'
-        env_file_encoding = 'utf-8'
-        case_sensitive = True
 
-# Create settings instance
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Get the settings instance, created once per process."""
+    # Settings reads .env itself too, so honour SKIP_DOTENV there as well
+    if _SKIP_DOTENV:
+        return Settings(_env_file=None)
+    return Settings()
 
 # Create logs directory if it doesn't exist
 os.makedirs('logs', exist_ok=True)
@@ -1,19 +1,20 @@
-from contextlib import contextmanager
-from sqlalchemy import create_engine
-from sqlalchemy.orm import scoped_session, sessionmaker
-from config import settings
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Iterable, List
+from sqlalchemy import Row, create_engine, event, inspect, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from config import get_settings
+from .models import Base, IdentifierRecord
 import logging
 import os
 from urllib.parse import urlparse
 from pathlib import Path
 
-# Configure logging
-logging.basicConfig(level=settings.LOG_LEVEL)
 logger = logging.getLogger(__name__)
 
 def get_database_url():
     """Get the database URL and ensure the directory exists for SQLite."""
-    db_url = settings.DATABASE_URL
+    db_url = get_settings().DATABASE_URL
     
     # Only handle SQLite URLs
     if db_url.startswith('sqlite'):
@@ -30,50 +31,142 @@ def get_database_url():
     
     return db_url
 
+def get_async_database_url(db_url: str) -> str:
+    """Get the async driver variant of a database URL (aiosqlite for SQLite)."""
+    if db_url.startswith('sqlite:'):
+        return db_url.replace('sqlite:', 'sqlite+aiosqlite:', 1)
+    return db_url
+
 # Get the database URL with directory creation if needed
 DATABASE_URL = get_database_url()
+ASYNC_DATABASE_URL = get_async_database_url(DATABASE_URL)
 
 # SQLite specific configuration
 connect_args = {'check_same_thread': False} if 'sqlite' in DATABASE_URL else {}
 
-# Create database engine with appropriate connection args
+# Liveness checks and periodic recycling only help with networked databases; for a
+# local SQLite file they add a SELECT 1 per checkout and drop warm connections
+if DATABASE_URL.startswith('sqlite'):
+    pool_options = {}
+else:
+    pool_options = {'pool_pre_ping': True, 'pool_recycle': 300}
+
+# Sync engine, used for schema creation and migration scripts
 engine = create_engine(
     DATABASE_URL,
     connect_args=connect_args,
-    pool_pre_ping=True,
-    pool_recycle=300,
-    echo=settings.LOG_LEVEL == 'DEBUG'  # Enable SQL echo in debug mode
+    echo=get_settings().LOG_LEVEL == 'DEBUG',  # Enable SQL echo in debug mode
+    **pool_options
+)
+
+# Async engine used for all queries so they don't block the event loop
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    echo=get_settings().LOG_LEVEL == 'DEBUG',
+    **pool_options
 )
 
-# Create a scoped session factory
-SessionLocal = scoped_session(sessionmaker(autocommit=False, autoflush=False, bind=engine))
+# Create an async session factory
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+
+# SQLite tuning applied to every new connection: WAL lets readers proceed during
+# writes, NORMAL sync halves fsyncs, and mmap plus a 64MB page cache keep the
+# identifier index in memory
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+)
+
+def _set_sqlite_pragmas(dbapi_conn, connection_record):
+    """Apply SQLITE_PRAGMAS to a freshly opened connection."""
+    cursor = dbapi_conn.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+if DATABASE_URL.startswith('sqlite'):
+    event.listen(engine, "connect", _set_sqlite_pragmas)
+    event.listen(async_engine.sync_engine, "connect", _set_sqlite_pragmas)
 
 # Dependency to get DB session
-@contextmanager
-def get_db():
+@asynccontextmanager
+async def get_db():
     """Database session context manager."""
-    db = SessionLocal()
-    try:
-        yield db
-        db.commit()
-    except Exception as e:
-        db.rollback()
-        logger.error(f"Database error: {e}")
-        raise
-    finally:
-        db.close()
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Database error: {e}")
+            raise
+
+_INSERT_IDENTIFIER_STMT = sqlite_insert(IdentifierRecord).on_conflict_do_nothing(
+    index_elements=['identifier']
+).returning(IdentifierRecord.id, IdentifierRecord.identifier)
+
+async def find_identifiers(db: AsyncSession, identifiers: Iterable[str]) -> Dict[str, Row]:
+    """Fetch the monitored records matching any of the given identifiers in one query.
+    
+    Returns plain rows (id, identifier, identifier_type, created_at) keyed by
+    identifier; no ORM objects are built or tracked in the session.
+    """
+    identifiers = list(identifiers)
+    if not identifiers:
+        return {}
+    result = await db.execute(
+        select(
+            IdentifierRecord.id,
+            IdentifierRecord.identifier,
+            IdentifierRecord.identifier_type,
+            IdentifierRecord.created_at
+        ).where(
+            IdentifierRecord.identifier.in_(identifiers),
+            IdentifierRecord.is_duplicate == False
+        )
+    )
+    return {row.identifier: row for row in result}
+
+async def bulk_insert_identifiers(db: AsyncSession, rows: List[Dict[str, Any]]) -> Dict[str, int]:
+    """Insert identifier rows in one statement, skipping ones that already exist.
+    
+    Returns a mapping of each newly inserted identifier to its ID.
+    """
+    if not rows:
+        return {}
+    # Rows are passed as execute() parameters rather than baked in with .values(),
+    # so the statement has one shape and is compiled once from the SQL cache
+    result = await db.execute(_INSERT_IDENTIFIER_STMT, rows)
+    return {identifier: record_id for record_id, identifier in result}
 
 def init_db():
-    """Initialize the database."""
-    # Import models to register them with SQLAlchemy
-    from . import models
-    from sqlalchemy.ext.declarative import declarative_base
+    """Initialize the database.
+    
+    Only missing tables and indexes are created, so on an up-to-date schema this
+    is a couple of catalog reads rather than a round of DDL.
+    """
+    insp = inspect(engine)
+    tables = Base.metadata.sorted_tables
+    missing_tables = [table for table in tables if not insp.has_table(table.name)]
     
-    # Create all tables
-    models.Base.metadata.create_all(bind=engine)
-    logger.info("Database tables created")
-
-def close_db_connection():
-    """Close the database connection."""
-    if SessionLocal.registry.has():
-        SessionLocal.remove()
+    # Create missing tables (with their indexes)
+    if missing_tables:
+        Base.metadata.create_all(bind=engine, tables=missing_tables)
+        logger.info(f"Created tables: {', '.join(table.name for table in missing_tables)}")
+    
+    # create_all skips indexes on tables that already exist, so add any new ones
+    for table in tables:
+        if table in missing_tables:
+            continue
+        existing_indexes = {index['name'] for index in insp.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing_indexes:
+                index.create(bind=engine)
+                logger.info(f"Created index {index.name}")
+
+async def close_db_connection():
+    """Close the database connections."""
+    await async_engine.dispose()
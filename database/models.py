@@ -1,14 +1,17 @@
+import re
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
-from .database import SessionLocal
+from typing import Optional
+from sqlalchemy import String, Text, ForeignKey, Index
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship, validates
 
-# Create the declarative base
-Base = declarative_base()
+_WHITESPACE_RE = re.compile(r'\s+')
 
-# Set up query property for models
-Base.query = SessionLocal.query_property()
+def normalize_identifier(value: str) -> str:
+    """Normalize an identifier to its stored form: trimmed, with whitespace runs collapsed."""
+    return _WHITESPACE_RE.sub(' ', value).strip()
+
+class Base(DeclarativeBase):
+    """Declarative base for all models."""
 
 class IdentifierRecord(Base):
     """Stores unique identifiers that need to be tracked for duplicates.
@@ -17,17 +20,27 @@ class IdentifierRecord(Base):
     bank account, reference code, etc.
     """
     __tablename__ = "identifier_records"
+    __table_args__ = (
+        # Covers the active-identifier lookup done for every incoming message
+        Index('ix_identifier_active', 'identifier', 'is_duplicate'),
+        # Per-group identifier queries
+        Index('ix_identifier_group', 'group_id', 'identifier'),
+    )
+    
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    identifier: Mapped[str] = mapped_column(String(100), unique=True, index=True, comment="The unique identifier (phone, account, reference, etc.)")
+    identifier_type: Mapped[Optional[str]] = mapped_column(String(20), comment="Type of identifier (phone, account, reference, etc.)")
+    notes: Mapped[Optional[str]] = mapped_column(Text)
+    group_id: Mapped[Optional[str]] = mapped_column(String(100), comment="ID of the group where this identifier was first seen")
+    message_id: Mapped[Optional[int]] = mapped_column(comment="ID of the message where this identifier was first seen")
+    user_id: Mapped[Optional[int]] = mapped_column(comment="ID of the user who added this identifier")
+    is_duplicate: Mapped[Optional[bool]] = mapped_column(default=False, comment="Whether this is a duplicate of another identifier")
+    created_at: Mapped[Optional[datetime]] = mapped_column(default=datetime.utcnow)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    id = Column(Integer, primary_key=True, index=True)
-    identifier = Column(String(100), nullable=False, unique=True, index=True, comment="The unique identifier (phone, account, reference, etc.)")
-    identifier_type = Column(String(20), nullable=True, comment="Type of identifier (phone, account, reference, etc.)")
-    notes = Column(Text, nullable=True)
-    group_id = Column(String(100), nullable=True, comment="ID of the group where this identifier was first seen")
-    message_id = Column(Integer, nullable=True, comment="ID of the message where this identifier was first seen")
-    user_id = Column(Integer, nullable=True, comment="ID of the user who added this identifier")
-    is_duplicate = Column(Boolean, default=False, comment="Whether this is a duplicate of another identifier")
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    @validates('identifier')
+    def _normalize_identifier(self, key, value):
+        return normalize_identifier(value)
     
     def __repr__(self):
         return f"<IdentifierRecord(id={self.id}, identifier='{self.identifier}', type='{self.identifier_type}')>"
@@ -35,17 +48,25 @@ class IdentifierRecord(Base):
 class DuplicateAlert(Base):
     """Tracks duplicate identifier detections."""
     __tablename__ = "duplicate_alerts"
+    __table_args__ = (
+        # Pending-alert queue ordered by detection time
+        Index('ix_alert_status_created', 'status', 'created_at'),
+    )
     
-    id = Column(Integer, primary_key=True, index=True)
-    identifier = Column(String(100), nullable=False, comment="The duplicate identifier that was detected")
-    original_id = Column(Integer, ForeignKey('identifier_records.id'), nullable=False, comment="Reference to the original identifier record")
-    duplicate_id = Column(Integer, ForeignKey('identifier_records.id'), nullable=True, comment="Reference to the duplicate identifier record (if created)")
-    status = Column(String(20), default="pending", comment="Status of the alert (pending, resolved)")
-    created_at = Column(DateTime, default=datetime.utcnow)
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    identifier: Mapped[str] = mapped_column(String(100), comment="The duplicate identifier that was detected")
+    original_id: Mapped[int] = mapped_column(ForeignKey('identifier_records.id'), comment="Reference to the original identifier record")
+    duplicate_id: Mapped[Optional[int]] = mapped_column(ForeignKey('identifier_records.id'), comment="Reference to the duplicate identifier record (if created)")
+    status: Mapped[Optional[str]] = mapped_column(String(20), default="pending", comment="Status of the alert (pending, resolved)")
+    created_at: Mapped[Optional[datetime]] = mapped_column(default=datetime.utcnow)
     
     # Relationships
-    original = relationship("IdentifierRecord", foreign_keys=[original_id])
-    duplicate = relationship("IdentifierRecord", foreign_keys=[duplicate_id])
+    original: Mapped["IdentifierRecord"] = relationship(foreign_keys=[original_id])
+    duplicate: Mapped[Optional["IdentifierRecord"]] = relationship(foreign_keys=[duplicate_id])
+    
+    @validates('identifier')
+    def _normalize_identifier(self, key, value):
+        return normalize_identifier(value)
     
     def __repr__(self):
         return f"<DuplicateAlert(id={self.id}, identifier='{self.identifier}', status='{self.status}')>"